@@ -1,6 +1,7 @@
 # main.py - Updated with Authentication
 from fastapi import FastAPI, HTTPException, Depends, UploadFile, File, Form, status
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.concurrency import run_in_threadpool
 from pydantic import BaseModel, EmailStr, Field
 from typing import Optional, List
 from datetime import datetime, timedelta
@@ -11,7 +12,7 @@ from paddleocr import PaddleOCR
 from bson import ObjectId
 
 # Import OCR, NLP, and Validation modules
-from ocr_processor import PaddleOCRProcessor
+from ocr_processor import get_ocr_processor
 from nlp_extractor import NLPEntityExtractor, process_document_with_nlp
 from validation_scorer import ValidationRiskScorer, format_validation_report
 
@@ -59,7 +60,7 @@ async def startup_db_client():
     await db.kyc_cases.create_index("status")
     
     # Initialize OCR, NLP, and Validation processors
-    ocr_processor = PaddleOCRProcessor(use_gpu=False, lang='en')
+    ocr_processor = get_ocr_processor(use_gpu=False, lang='en')
     nlp_extractor = NLPEntityExtractor(model_name='en_core_web_sm')
     validation_scorer = ValidationRiskScorer()
     
@@ -472,8 +473,12 @@ async def upload_document(
     try:
         file_content = await file.read()
         
-        # Validate document quality
-        quality_check = ocr_processor.validate_document_quality(file_content)
+        # Validate document quality and process with OCR (single decode).
+        # OpenCV/Paddle release the GIL, so run it in the threadpool and keep
+        # the event loop free for other uploads and requests
+        quality_check, ocr_result = await run_in_threadpool(
+            ocr_processor.process_document, file_content, doc_type
+        )
         
         if not quality_check['valid']:
             raise HTTPException(
@@ -481,16 +486,10 @@ async def upload_document(
                 detail=f"Document quality check failed: {quality_check['reason']}"
             )
         
-        # Process document with OCR
-        if doc_type == 'pan':
-            ocr_result = ocr_processor.extract_pan_specific(file_content)
-        elif doc_type == 'aadhaar':
-            ocr_result = ocr_processor.extract_aadhaar_specific(file_content)
-        elif doc_type == 'passport':
-            ocr_result = ocr_processor.extract_passport_specific(file_content)
-        
         # Process with NLP
-        combined_result = process_document_with_nlp(ocr_result, nlp_extractor)
+        combined_result = await run_in_threadpool(
+            process_document_with_nlp, ocr_result, nlp_extractor
+        )
         
         # Cross-validate with form data
         form_data = {
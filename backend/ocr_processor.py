@@ -1,12 +1,185 @@
 # ocr_processor_fixed.py - Fixed version with PaddleOCR integration
 import io
+import multiprocessing
 import os
+import threading
+from collections import deque
 from PIL import Image
 import cv2
 import numpy as np
-from typing import Dict, Optional, Union, List
+from typing import Dict, Optional, Union, List, Tuple
 import re
-from pdf2image import convert_from_bytes
+from pdf2image import convert_from_bytes, pdfinfo_from_bytes
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+
+# Magic bytes of the upload containers handled specially
+_FORMAT_SIGNATURES = [
+    (b'%PDF', 'pdf'),
+    (b'\xff\xd8\xff', 'jpeg'),
+    (b'\x89PNG\r\n\x1a\n', 'png'),
+    (b'II*\x00', 'tiff'),
+    (b'MM\x00*', 'tiff')
+]
+
+# Decompression-bomb guard sized to the 10000x10000 quality-check limit
+# (PIL warns above this and raises DecompressionBombError above twice it)
+Image.MAX_IMAGE_PIXELS = 10000 * 10000
+
+# Name patterns, tried in order; compiled once instead of per OCR call
+_NAME_PATTERNS = [
+    re.compile(r'(?i)name[:\s]+([A-Z][a-z]+(?:\s+[A-Z][a-z]+){1,3})'),
+    re.compile(r'\b([A-Z][a-z]+(?:\s+[A-Z][a-z]+){1,3})\b')
+]
+
+# Common non-name words, matched in a single scan of the candidate name
+_NON_NAME_WORDS_RE = re.compile(r'Income|Tax|Government|India|Permanent')
+
+# ID number patterns, searched separately: one combined alternation would
+# not find overlapping matches (a DOB year swallowing an Aadhaar digit group)
+_ID_PATTERNS = {
+    'pan_number': re.compile(r'\b[A-Z]{5}[0-9]{4}[A-Z]{1}\b'),
+    'aadhaar_number': re.compile(r'\b\d{4}\s?\d{4}\s?\d{4}\b'),
+    'passport_number': re.compile(r'\b[A-Z]{1}\d{7}\b')
+}
+
+# Date of birth patterns, in order of preference
+_DOB_PATTERNS = [
+    re.compile(r'\b(\d{2}[-/]\d{2}[-/]\d{4})\b'),
+    re.compile(r'\b(\d{4}[-/]\d{2}[-/]\d{2})\b'),
+    re.compile(r'\b(\d{2}\s+[A-Za-z]+\s+\d{4})\b')
+]
+
+# Long side (pixels) of the sample used for quality-check statistics
+_QUALITY_SAMPLE_SIDE = 512
+
+# Long side (pixels) that OCR input is allowed to be reduced to
+_OCR_TARGET_SIDE = 2000
+
+# libjpeg scale-down factors and matching imdecode flags, largest first
+_JPEG_REDUCED_FLAGS = [
+    (8, cv2.IMREAD_REDUCED_COLOR_8),
+    (4, cv2.IMREAD_REDUCED_COLOR_4),
+    (2, cv2.IMREAD_REDUCED_COLOR_2)
+]
+
+# OpenCV built with CUDA support and a device present
+try:
+    _CUDA_AVAILABLE = cv2.cuda.getCudaEnabledDeviceCount() > 0
+except (AttributeError, cv2.error):
+    _CUDA_AVAILABLE = False
+
+# Persistent pools for per-page PDF OCR, one per (use_gpu, lang); each worker
+# keeps its own warm PaddleOCR, so the worker count is capped by memory
+# rather than by cores
+_OCR_MAX_WORKERS = min(4, os.cpu_count() or 1)
+_ocr_executors: Dict[Tuple[bool, str], ProcessPoolExecutor] = {}
+_ocr_executors_lock = threading.Lock()
+_worker_ocr = None
+
+
+def _init_worker_ocr(use_gpu: bool, lang: str):
+    """Create one PaddleOCR instance per worker process"""
+    global _worker_ocr
+    from paddleocr import PaddleOCR
+    
+    _worker_ocr = PaddleOCR(use_angle_cls=True, lang=lang, use_gpu=use_gpu)
+
+
+def _ocr_one_page(img: np.ndarray) -> List:
+    """Run OCR on a single page inside a worker process"""
+    result = _worker_ocr.ocr(img, cls=True)
+    return result[0] if result and result[0] else []
+
+
+def _sniff_format(data: Union[bytes, memoryview]) -> Optional[str]:
+    """Identify the upload container ('pdf', 'jpeg', 'png', 'tiff') from its magic bytes"""
+    head = bytes(data[:8])
+    for signature, fmt in _FORMAT_SIGNATURES:
+        if head.startswith(signature):
+            return fmt
+    return None
+
+
+def _summarize_ocr_lines(lines) -> Tuple[List[str], List[float], float]:
+    """
+    Split PaddleOCR line results into texts and confidences and compute the
+    mean confidence with a single numpy reduction
+    """
+    pairs = [(line[1][0], line[1][1]) for line in lines if line and len(line) >= 2]
+    if not pairs:
+        return [], [], 0.0
+    
+    # Transpose (text, confidence) pairs in C rather than with two list walks
+    text_lines, confidences = (list(column) for column in zip(*pairs))
+    avg_confidence = float(np.asarray(confidences, dtype=np.float64).mean())
+    return text_lines, confidences, avg_confidence
+
+
+def _weighted_confidence(text_lines: List[str], confidences: List[float]) -> float:
+    """
+    Mean confidence weighted by text length, so a long low-confidence line
+    counts for more than a stray one-character box
+    """
+    confs = np.asarray(confidences, dtype=np.float64)
+    weights = np.fromiter(map(len, text_lines), dtype=np.float64, count=len(text_lines))
+    mask = (confs >= 0) & (weights > 0)
+    if not mask.any():
+        return 0.0
+    return float(np.average(confs[mask], weights=weights[mask]))
+
+
+def _to_gray(img: np.ndarray) -> np.ndarray:
+    """Grayscale view of an OpenCV image; single-channel input is returned as-is"""
+    if img.ndim == 3:
+        return cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
+    return img
+
+
+def _cuda_mean_std(gpu_gray) -> Tuple[float, float]:
+    """
+    Mean and std dev of a single-channel GpuMat. Depending on the OpenCV
+    build, cv2.cuda.meanStdDev returns (mean, stddev) or a 1x2 CV_64F result
+    (as a GpuMat or already downloaded)
+    """
+    stats = cv2.cuda.meanStdDev(gpu_gray)
+    if isinstance(stats, tuple):
+        return float(np.ravel(stats[0])[0]), float(np.ravel(stats[1])[0])
+    if hasattr(stats, 'download'):
+        stats = stats.download()
+    mean, std_dev = np.ravel(stats)
+    return float(mean), float(std_dev)
+
+
+def _downscale_for_ocr(img: np.ndarray, target_side: int) -> np.ndarray:
+    """
+    Shrink a full-resolution image by the same 1/2, 1/4 or 1/8 factor a
+    reduced JPEG decode would use, keeping the long side >= target_side
+    """
+    height, width = img.shape[:2]
+    for factor, _ in _JPEG_REDUCED_FLAGS:
+        if max(height, width) // factor >= target_side:
+            return cv2.resize(img, (width // factor, height // factor), interpolation=cv2.INTER_AREA)
+    return img
+
+
+def _get_ocr_executor(use_gpu: bool, lang: str) -> ProcessPoolExecutor:
+    """Create the worker pool for (use_gpu, lang) on first use and reuse it afterwards"""
+    key = (use_gpu, lang)
+    with _ocr_executors_lock:
+        executor = _ocr_executors.get(key)
+        if executor is None:
+            # Spawned, not forked: a fork of a process that has already
+            # loaded Paddle (and possibly initialized CUDA) is not usable
+            executor = ProcessPoolExecutor(
+                max_workers=_OCR_MAX_WORKERS,
+                mp_context=multiprocessing.get_context('spawn'),
+                initializer=_init_worker_ocr,
+                initargs=key
+            )
+            _ocr_executors[key] = executor
+        return executor
+
 
 class PaddleOCRProcessor:
     """
@@ -26,21 +199,83 @@ class PaddleOCRProcessor:
         
         self.ocr = PaddleOCR(use_angle_cls=True, lang=lang, use_gpu=use_gpu)
         self.lang = lang
+        self.use_gpu = use_gpu
+        # The Paddle predictor is not thread-safe; decoding and quality checks
+        # can run concurrently, recognition is serialized
+        self._ocr_lock = threading.Lock()
     
-    def validate_document_quality(self, file_content: bytes) -> Dict:
+    def process_document(self, file_content: bytes, doc_type: str) -> Tuple[Dict, Optional[Dict]]:
+        """
+        Quality-check and OCR a document, decoding the upload only once
+        
+        Args:
+            file_content: Raw file bytes
+            doc_type: 'pan', 'aadhaar' or 'passport'
+            
+        Returns:
+            (quality check result, OCR result); the OCR result is None when
+            the quality check fails
+        """
+        extractors = {
+            'pan': self.extract_pan_specific,
+            'aadhaar': self.extract_aadhaar_specific,
+            'passport': self.extract_passport_specific
+        }
+        
+        # Reject on header dimensions before decoding any pixels
+        size, dimension_error = self._check_header(file_content)
+        if dimension_error:
+            return dimension_error, None
+        
+        # Decode once at full resolution: the quality statistics need
+        # unaveraged pixels (a reduced JPEG decode averages away sparse text
+        # and reads as low contrast)
+        img = self._load_image_from_bytes(file_content, size=size)
+        
+        quality_check = self.validate_document_quality(file_content, img=img, size=size)
+        if not quality_check['valid']:
+            return quality_check, None
+        
+        # OCR gets the same reduced-size input as a standalone extract_* call
+        if _sniff_format(file_content) == 'jpeg':
+            img = _downscale_for_ocr(img, _OCR_TARGET_SIDE)
+        
+        return quality_check, extractors[doc_type](file_content, img=img)
+    
+    def validate_document_quality(
+        self,
+        file_content: bytes,
+        img: Optional[np.ndarray] = None,
+        size: Optional[Tuple[int, int]] = None
+    ) -> Dict:
         """
         FIXED: Validate document quality before OCR processing
         This method was missing in PaddleOCR, causing the AttributeError
         
         Args:
             file_content: Raw file bytes
+            img: Already decoded image, to avoid decoding file_content again
+            size: Original (width, height) if img was decoded at reduced scale
             
         Returns:
             Validation result dictionary
         """
         try:
-            # Try to load as image first
-            img = self._load_image_from_bytes(file_content)
+            # Check dimensions from the header alone before decoding (Image.open
+            # is lazy), so oversized uploads fail without allocating pixels
+            if img is None and size is None:
+                size, dimension_error = self._check_header(file_content)
+                if dimension_error:
+                    return dimension_error
+            elif size is not None:
+                dimension_error = self._check_dimensions(*size)
+                if dimension_error:
+                    return dimension_error
+            
+            # Try to load as image at full resolution: a reduced or draft JPEG
+            # decode averages pixels and understates the contrast of sparse text
+            if img is None:
+                img = self._load_image_from_bytes(file_content, size=size)
             
             if img is None:
                 return {
@@ -49,32 +284,17 @@ class PaddleOCRProcessor:
                     'details': {}
                 }
             
-            # Check image dimensions
-            height, width = img.shape[:2]
-            
-            if width < 100 or height < 100:
-                return {
-                    'valid': False,
-                    'reason': f'Image too small: {width}x{height} pixels (minimum 100x100)',
-                    'details': {'size': (width, height)}
-                }
-            
-            # Check if image is too large
-            if width > 10000 or height > 10000:
-                return {
-                    'valid': False,
-                    'reason': f'Image too large: {width}x{height} pixels (maximum 10000x10000)',
-                    'details': {'size': (width, height)}
-                }
-            
-            # Check image content (not blank)
-            if len(img.shape) == 3:
-                gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
+            # Formats PIL cannot size from the header (e.g. PDF)
+            if size is not None:
+                width, height = size
             else:
-                gray = img
+                height, width = img.shape[:2]
+                dimension_error = self._check_dimensions(width, height)
+                if dimension_error:
+                    return dimension_error
             
-            std_dev = np.std(gray)
-            mean_brightness = np.mean(gray)
+            # Check image content (not blank)
+            mean_brightness, std_dev = self._gray_stats(img)
             
             if std_dev < 5:
                 return {
@@ -108,58 +328,238 @@ class PaddleOCRProcessor:
                 'details': {}
             }
     
-    def _load_image_from_bytes(self, file_content: bytes) -> Optional[np.ndarray]:
+    def _check_dimensions(self, width: int, height: int) -> Optional[Dict]:
+        """
+        Check image dimensions against the quality limits
+        
+        Returns:
+            Failed validation result, or None if the dimensions are acceptable
+        """
+        if width < 100 or height < 100:
+            return {
+                'valid': False,
+                'reason': f'Image too small: {width}x{height} pixels (minimum 100x100)',
+                'details': {'size': (width, height)}
+            }
+        
+        # Check if image is too large
+        if width > 10000 or height > 10000:
+            return {
+                'valid': False,
+                'reason': f'Image too large: {width}x{height} pixels (maximum 10000x10000)',
+                'details': {'size': (width, height)}
+            }
+        
+        return None
+    
+    def _check_header(self, file_content: bytes) -> Tuple[Optional[Tuple[int, int]], Optional[Dict]]:
+        """
+        Read the dimensions from the image header and check them before any
+        pixels are decoded
+        
+        Args:
+            file_content: Raw file bytes
+            
+        Returns:
+            ((width, height) or None if the header cannot be sized,
+            failed validation result or None)
+        """
+        try:
+            size = self._peek_dimensions(file_content)
+        except Image.DecompressionBombError as bomb_error:
+            return None, {
+                'valid': False,
+                'reason': f'Image too large: {str(bomb_error)}',
+                'details': {}
+            }
+        
+        return size, (self._check_dimensions(*size) if size else None)
+    
+    def _gray_stats(self, img: np.ndarray) -> Tuple[float, float]:
+        """
+        Mean brightness and standard deviation of the grayscale image,
+        computed on the GPU (NPP via cv2.cuda) when enabled
+        
+        Args:
+            img: OpenCV image (numpy array)
+            
+        Returns:
+            (mean, std_dev)
+        """
+        if self.use_gpu and _CUDA_AVAILABLE and img.dtype == np.uint8:
+            try:
+                gpu_img = cv2.cuda_GpuMat()
+                gpu_img.upload(img)
+                if img.ndim == 3:
+                    gpu_img = cv2.cuda.cvtColor(gpu_img, cv2.COLOR_BGR2GRAY)
+                return _cuda_mean_std(gpu_img)
+            except Exception as e:
+                print(f"GPU quality check failed, using CPU: {str(e)}")
+        
+        # Mean/std of a strided sample (~512 px on the long side) are
+        # statistically the same as over the full image
+        step = max(1, max(img.shape[:2]) // _QUALITY_SAMPLE_SIDE)
+        sample = np.ascontiguousarray(img[::step, ::step])
+        
+        gray = _to_gray(sample)
+        return float(np.mean(gray)), float(np.std(gray))
+    
+    def _peek_dimensions(self, file_content: bytes) -> Optional[Tuple[int, int]]:
+        """
+        Read (width, height) from the image header without decoding pixels
+        
+        Args:
+            file_content: Raw file bytes (not a memoryview: BytesIO shares a
+                bytes buffer but copies any other)
+            
+        Returns:
+            (width, height) or None if the header cannot be parsed
+            
+        Raises:
+            Image.DecompressionBombError: the header declares more than twice
+                Image.MAX_IMAGE_PIXELS
+        """
+        # PIL cannot size PDFs; skip the failing open
+        if _sniff_format(file_content) == 'pdf':
+            return None
+        
+        try:
+            with Image.open(io.BytesIO(file_content)) as pil_img:
+                return pil_img.size
+        except Image.DecompressionBombError:
+            raise
+        except Exception:
+            return None
+    
+    def _decode_jpeg_reduced(
+        self,
+        mv: memoryview,
+        target_side: int,
+        size: Tuple[int, int]
+    ) -> Optional[np.ndarray]:
+        """
+        Decode a large JPEG directly at 1/2, 1/4 or 1/8 scale (DCT-domain
+        downsampling in libjpeg) while keeping the long side >= target_side
+        
+        Args:
+            mv: View over the raw JPEG bytes
+            target_side: Minimum long side of the decoded image
+            size: (width, height) from the JPEG header
+            
+        Returns:
+            OpenCV image, or None if no reduction applies
+        """
+        long_side = max(size)
+        for factor, flag in _JPEG_REDUCED_FLAGS:
+            if long_side // factor >= target_side:
+                return cv2.imdecode(np.frombuffer(mv, np.uint8), flag)
+        
+        return None
+    
+    def _load_image_from_bytes(
+        self,
+        file_content: Union[bytes, memoryview],
+        target_side: Optional[int] = None,
+        size: Optional[Tuple[int, int]] = None
+    ) -> Optional[np.ndarray]:
         """
         FIXED: Load image from bytes with proper BytesIO handling
         Supports both regular images (JPG, PNG) and PDFs
         
         Args:
-            file_content: Raw file bytes
+            file_content: Raw file bytes (or a memoryview over them)
+            target_side: If set, large JPEGs are decoded at reduced scale with
+                their long side kept at or above this many pixels
+            size: (width, height) already read from the header, if known
             
         Returns:
             OpenCV image (numpy array) or None
         """
         try:
+            # Single zero-copy view shared by the header check and OpenCV decode
+            mv = memoryview(file_content)
+            
+            # Container sniffed from the magic bytes, without opening the file
+            fmt = _sniff_format(mv)
+            
+            # The OpenCV fast paths skip PIL's decompression-bomb guard, so they
+            # are only taken once the header dimensions are known and in range
+            if size is None and fmt != 'pdf':
+                size = self._peek_dimensions(file_content)
+            header_ok = size is not None and self._check_dimensions(*size) is None
+            
+            # Large JPEG and the caller does not need full resolution
+            if target_side and fmt == 'jpeg' and header_ok:
+                img_cv = self._decode_jpeg_reduced(mv, target_side, size)
+                if img_cv is not None:
+                    return img_cv
+            
             # First, try to detect if it's a PDF
-            if file_content[:4] == b'%PDF':
+            if fmt == 'pdf':
                 # It's a PDF - convert to images
                 images = convert_from_bytes(file_content, dpi=300, first_page=1, last_page=1)
                 if images:
-                    # Convert PIL Image to OpenCV format
+                    # Convert PIL Image to OpenCV format, then release the
+                    # rendered page before returning
                     pil_img = images[0]
-                    return cv2.cvtColor(np.array(pil_img), cv2.COLOR_RGB2BGR)
+                    img_cv = cv2.cvtColor(np.asarray(pil_img), cv2.COLOR_RGB2BGR)
+                    pil_img.close()
+                    del images, pil_img
+                    return img_cv
                 else:
                     return None
             
-            # Not a PDF, try as regular image
+            # Not a PDF, try as regular image. OpenCV decodes straight to BGR
+            # (or single-channel for grayscale files), skipping PIL's RGB
+            # buffer and the RGB->BGR conversion
+            if header_ok:
+                img_cv = cv2.imdecode(np.frombuffer(mv, np.uint8), cv2.IMREAD_ANYCOLOR)
+                if img_cv is not None:
+                    return img_cv
+            
+            # Formats OpenCV cannot read
             # CRITICAL FIX: Proper BytesIO handling
             img_io = io.BytesIO(file_content)
-            img_io.seek(0)  # Ensure we're at the start
             
             # Try opening with PIL first
             try:
-                pil_img = Image.open(img_io)
-                pil_img.load()  # Force loading of image data
-                
-                # Convert PIL Image to OpenCV format
-                img_array = np.array(pil_img)
+                with Image.open(img_io) as pil_img:
+                    # Single-channel scans stay single-channel (2-D), so callers
+                    # can skip the grayscale conversion entirely. Converted
+                    # copies are closed as soon as their pixels are extracted
+                    if pil_img.mode in ('1', 'LA'):
+                        with pil_img.convert('L') as gray_img:
+                            img_array = np.asarray(gray_img)
+                    else:
+                        # Convert PIL Image to OpenCV format (decodes exactly once)
+                        img_array = np.asarray(pil_img)
                 
                 # Convert RGB to BGR if needed (OpenCV uses BGR)
-                if len(img_array.shape) == 3 and img_array.shape[2] == 3:
+                if img_array.ndim == 3 and img_array.shape[2] == 3:
                     img_cv = cv2.cvtColor(img_array, cv2.COLOR_RGB2BGR)
                 else:
                     img_cv = img_array
                 
                 img_io.close()
+                # Drop the decoder buffer and our reference to the upload early
+                del pil_img, img_array, img_io, file_content
                 return img_cv
                 
+            except Image.DecompressionBombError as bomb_error:
+                # Oversized image: do not retry the decode with OpenCV
+                img_io.close()
+                print(f"Rejected image: {str(bomb_error)}")
+                return None
+                
             except Exception as pil_error:
                 # PIL failed, try direct OpenCV decode
                 img_io.close()
+                del img_io
                 
-                # Use OpenCV to decode from bytes
-                nparr = np.frombuffer(file_content, np.uint8)
+                # Use OpenCV to decode from the zero-copy view
+                nparr = np.frombuffer(mv, np.uint8)
                 img_cv = cv2.imdecode(nparr, cv2.IMREAD_COLOR)
+                del nparr, file_content
                 
                 if img_cv is not None:
                     return img_cv
@@ -167,6 +567,11 @@ class PaddleOCRProcessor:
                     print(f"Failed to decode image: {str(pil_error)}")
                     return None
                     
+        except Image.DecompressionBombError as bomb_error:
+            # Header declares an oversized image: decode nothing
+            print(f"Rejected image: {str(bomb_error)}")
+            return None
+            
         except Exception as e:
             print(f"Error loading image from bytes: {str(e)}")
             return None
@@ -183,10 +588,7 @@ class PaddleOCRProcessor:
         """
         try:
             # Convert to grayscale if needed
-            if len(img.shape) == 3:
-                gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
-            else:
-                gray = img
+            gray = _to_gray(img)
             
             # Denoise
             denoised = cv2.fastNlMeansDenoising(gray)
@@ -203,19 +605,21 @@ class PaddleOCRProcessor:
             print(f"Preprocessing failed, using original: {str(e)}")
             return img
     
-    def extract_text_generic(self, file_content: bytes) -> Dict:
+    def extract_text_generic(self, file_content: bytes, img: Optional[np.ndarray] = None) -> Dict:
         """
         Extract text from document using PaddleOCR
         
         Args:
             file_content: Raw file bytes
+            img: Already decoded image, to avoid decoding file_content again
             
         Returns:
             OCR result dictionary
         """
         try:
-            # Load image
-            img = self._load_image_from_bytes(file_content)
+            # Load image (large JPEGs are decoded at reduced scale)
+            if img is None:
+                img = self._load_image_from_bytes(file_content, target_side=_OCR_TARGET_SIDE)
             
             if img is None:
                 return {
@@ -226,7 +630,8 @@ class PaddleOCRProcessor:
                 }
             
             # Run PaddleOCR
-            result = self.ocr.ocr(img, cls=True)
+            with self._ocr_lock:
+                result = self.ocr.ocr(img, cls=True)
             
             if not result or not result[0]:
                 return {
@@ -237,26 +642,86 @@ class PaddleOCRProcessor:
                 }
             
             # Extract text and confidence
-            text_lines = []
-            confidences = []
+            text_lines, confidences, avg_confidence = _summarize_ocr_lines(result[0])
+            raw_text = '\n'.join(text_lines)
             
-            for line in result[0]:
-                if line and len(line) >= 2:
-                    text = line[1][0]  # Text content
-                    confidence = line[1][1]  # Confidence score
-                    
-                    text_lines.append(text)
-                    confidences.append(confidence)
+            return {
+                'status': 'success',
+                'raw_text': raw_text,
+                'confidence_score': avg_confidence,
+                'text_lines': text_lines,
+                'line_confidences': confidences,
+                'weighted_confidence_score': _weighted_confidence(text_lines, confidences)
+            }
+            
+        except Exception as e:
+            return {
+                'status': 'error',
+                'error': f'OCR processing failed: {str(e)}',
+                'raw_text': '',
+                'confidence_score': 0.0
+            }
+    
+    def _iter_pdf_pages(self, file_content: bytes):
+        """
+        Yield every page of a PDF as an OpenCV (BGR) image, rendering one page
+        at a time so only the pages being OCRed are held in memory
+        
+        Args:
+            file_content: Raw PDF bytes
+        """
+        page_count = pdfinfo_from_bytes(file_content)['Pages']
+        for page_number in range(1, page_count + 1):
+            pil_img = convert_from_bytes(file_content, dpi=300, first_page=page_number, last_page=page_number)[0]
+            yield cv2.cvtColor(np.asarray(pil_img), cv2.COLOR_RGB2BGR)
+            pil_img.close()
+    
+    def extract_text_pdf_parallel(self, file_content: bytes) -> Dict:
+        """
+        Extract text from a multi-page PDF, running OCR on its pages in parallel
+        across the persistent worker pool
+        
+        Args:
+            file_content: Raw PDF bytes
             
+        Returns:
+            OCR result dictionary (same shape as extract_text_generic)
+        """
+        try:
+            executor = _get_ocr_executor(self.use_gpu, self.lang)
+            
+            # Keep at most two pages per worker in flight (executor.map would
+            # render and queue the whole document up front)
+            pages = []
+            in_flight = deque()
+            for page_img in self._iter_pdf_pages(file_content):
+                if len(in_flight) >= 2 * _OCR_MAX_WORKERS:
+                    pages.append(in_flight.popleft().result())
+                in_flight.append(executor.submit(_ocr_one_page, page_img))
+            pages.extend(future.result() for future in in_flight)
+            
+            if not any(pages):
+                return {
+                    'status': 'error',
+                    'error': 'No text detected in document',
+                    'raw_text': '',
+                    'confidence_score': 0.0
+                }
+            
+            # Extract text and confidence, in page order
+            text_lines, confidences, avg_confidence = _summarize_ocr_lines(
+                line for page in pages for line in page
+            )
             raw_text = '\n'.join(text_lines)
-            avg_confidence = sum(confidences) / len(confidences) if confidences else 0.0
             
             return {
                 'status': 'success',
                 'raw_text': raw_text,
                 'confidence_score': avg_confidence,
                 'text_lines': text_lines,
-                'line_confidences': confidences
+                'line_confidences': confidences,
+                'weighted_confidence_score': _weighted_confidence(text_lines, confidences),
+                'page_count': len(pages)
             }
             
         except Exception as e:
@@ -267,17 +732,18 @@ class PaddleOCRProcessor:
                 'confidence_score': 0.0
             }
     
-    def extract_pan_specific(self, file_content: bytes) -> Dict:
+    def extract_pan_specific(self, file_content: bytes, img: Optional[np.ndarray] = None) -> Dict:
         """
         Extract PAN-specific information
         
         Args:
             file_content: Raw file bytes
+            img: Already decoded image, to avoid decoding file_content again
             
         Returns:
             Extracted PAN data
         """
-        result = self.extract_text_generic(file_content)
+        result = self.extract_text_generic(file_content, img=img)
         
         if result['status'] == 'error':
             return result
@@ -285,8 +751,7 @@ class PaddleOCRProcessor:
         text = result['raw_text']
         
         # Extract PAN number
-        pan_pattern = r'\b[A-Z]{5}[0-9]{4}[A-Z]{1}\b'
-        pan_match = re.search(pan_pattern, text)
+        id_match = _ID_PATTERNS['pan_number'].search(text)
         
         # Extract name
         name = self._extract_name_from_text(text)
@@ -296,33 +761,33 @@ class PaddleOCRProcessor:
         
         result['document_type'] = 'pan'
         result['extracted_fields'] = {
-            'pan_number': pan_match.group(0) if pan_match else None,
+            'pan_number': id_match.group(0) if id_match else None,
             'name': name,
             'dob': dob
         }
         
         return result
     
-    def extract_aadhaar_specific(self, file_content: bytes) -> Dict:
+    def extract_aadhaar_specific(self, file_content: bytes, img: Optional[np.ndarray] = None) -> Dict:
         """
         Extract Aadhaar-specific information
         
         Args:
             file_content: Raw file bytes
+            img: Already decoded image, to avoid decoding file_content again
             
         Returns:
             Extracted Aadhaar data
         """
-        result = self.extract_text_generic(file_content)
+        result = self.extract_text_generic(file_content, img=img)
         
         if result['status'] == 'error':
             return result
         
         text = result['raw_text']
         
-        # Extract Aadhaar number (with or without spaces)
-        aadhaar_pattern = r'\b\d{4}\s?\d{4}\s?\d{4}\b'
-        aadhaar_match = re.search(aadhaar_pattern, text)
+        # Extract Aadhaar number
+        id_match = _ID_PATTERNS['aadhaar_number'].search(text)
         
         # Extract name
         name = self._extract_name_from_text(text)
@@ -335,7 +800,7 @@ class PaddleOCRProcessor:
         
         result['document_type'] = 'aadhaar'
         result['extracted_fields'] = {
-            'aadhaar_number': aadhaar_match.group(0) if aadhaar_match else None,
+            'aadhaar_number': id_match.group(0) if id_match else None,
             'name': name,
             'dob': dob,
             'address': address
@@ -343,17 +808,18 @@ class PaddleOCRProcessor:
         
         return result
     
-    def extract_passport_specific(self, file_content: bytes) -> Dict:
+    def extract_passport_specific(self, file_content: bytes, img: Optional[np.ndarray] = None) -> Dict:
         """
         Extract Passport-specific information
         
         Args:
             file_content: Raw file bytes
+            img: Already decoded image, to avoid decoding file_content again
             
         Returns:
             Extracted Passport data
         """
-        result = self.extract_text_generic(file_content)
+        result = self.extract_text_generic(file_content, img=img)
         
         if result['status'] == 'error':
             return result
@@ -361,8 +827,7 @@ class PaddleOCRProcessor:
         text = result['raw_text']
         
         # Extract passport number
-        passport_pattern = r'\b[A-Z]{1}\d{7}\b'
-        passport_match = re.search(passport_pattern, text)
+        id_match = _ID_PATTERNS['passport_number'].search(text)
         
         # Extract name
         name = self._extract_name_from_text(text)
@@ -375,7 +840,7 @@ class PaddleOCRProcessor:
         
         result['document_type'] = 'passport'
         result['extracted_fields'] = {
-            'passport_number': passport_match.group(0) if passport_match else None,
+            'passport_number': id_match.group(0) if id_match else None,
             'name': name,
             'dob': dob,
             'address': address
@@ -386,31 +851,20 @@ class PaddleOCRProcessor:
     def _extract_name_from_text(self, text: str) -> Optional[str]:
         """Extract name from OCR text"""
         # Look for name patterns
-        name_patterns = [
-            r'(?i)name[:\s]+([A-Z][a-z]+(?:\s+[A-Z][a-z]+){1,3})',
-            r'\b([A-Z][a-z]+(?:\s+[A-Z][a-z]+){1,3})\b'
-        ]
-        
-        for pattern in name_patterns:
-            match = re.search(pattern, text)
+        for pattern in _NAME_PATTERNS:
+            match = pattern.search(text)
             if match:
                 name = match.group(1)
                 # Filter out common non-name words
-                if not any(word in name for word in ['Income', 'Tax', 'Government', 'India', 'Permanent']):
+                if not _NON_NAME_WORDS_RE.search(name):
                     return name
         
         return None
     
     def _extract_dob_from_text(self, text: str) -> Optional[str]:
         """Extract date of birth from text"""
-        date_patterns = [
-            r'\b(\d{2}[-/]\d{2}[-/]\d{4})\b',
-            r'\b(\d{4}[-/]\d{2}[-/]\d{2})\b',
-            r'\b(\d{2}\s+[A-Za-z]+\s+\d{4})\b'
-        ]
-        
-        for pattern in date_patterns:
-            match = re.search(pattern, text)
+        for pattern in _DOB_PATTERNS:
+            match = pattern.search(text)
             if match:
                 return match.group(1)
         
@@ -436,6 +890,15 @@ class PaddleOCRProcessor:
 OCRProcessor = PaddleOCRProcessor
 
 
+@lru_cache(maxsize=1)
+def get_ocr_processor(use_gpu: bool = False, lang: str = 'en') -> PaddleOCRProcessor:
+    """
+    Shared OCR processor, so the PaddleOCR models are loaded once per
+    process instead of once per caller
+    """
+    return PaddleOCRProcessor(use_gpu=use_gpu, lang=lang)
+
+
 if __name__ == "__main__":
     print("Testing Fixed PaddleOCR Processor")
     print("=" * 60)
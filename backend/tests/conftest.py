@@ -0,0 +1,22 @@
+import os
+import sys
+import threading
+
+import pytest
+
+# Backend modules import each other by flat module name
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture
+def processor():
+    """PaddleOCRProcessor without a loaded Paddle model (decode and quality checks only)"""
+    pytest.importorskip('pdf2image')
+    from ocr_processor import PaddleOCRProcessor
+    
+    proc = PaddleOCRProcessor.__new__(PaddleOCRProcessor)
+    proc.ocr = None
+    proc.lang = 'en'
+    proc.use_gpu = False
+    proc._ocr_lock = threading.Lock()
+    return proc
@@ -0,0 +1,152 @@
+import cv2
+import numpy as np
+import pytest
+
+
+def _sparse_text_jpeg(width: int, height: int, lines: int) -> bytes:
+    """Light page with a few thin text lines: low but real contrast"""
+    img = np.full((height, width, 3), 235, np.uint8)
+    for i in range(lines):
+        y = 300 + i * (height - 400) // lines
+        cv2.putText(img, 'PERMANENT ACCOUNT NUMBER ABCDE1234F', (200, y),
+                    cv2.FONT_HERSHEY_SIMPLEX, 1.5, (20, 20, 20), 1)
+    ok, buf = cv2.imencode('.jpg', img, [cv2.IMWRITE_JPEG_QUALITY, 90])
+    assert ok
+    return buf.tobytes()
+
+
+def test_process_document_large_sparse_text_jpeg_passes_blank_check(processor, monkeypatch):
+    # Full-resolution std dev is ~5.9; a 1/4-scale libjpeg decode reads ~4.5
+    data = _sparse_text_jpeg(9000, 7000, 4)
+    ocr_inputs = []
+    monkeypatch.setattr(processor, 'extract_pan_specific',
+                        lambda file_content, img=None: ocr_inputs.append(img.shape) or {})
+    
+    quality, _ = processor.process_document(data, 'pan')
+    
+    assert quality['valid'], quality['reason']
+    assert quality['details']['contrast'] >= 5
+    assert quality['details']['size'] == (9000, 7000)
+    # OCR still gets the reduced-size image
+    assert ocr_inputs == [(1750, 2250, 3)]
+
+
+def test_process_document_rejects_blank_jpeg(processor):
+    ok, buf = cv2.imencode('.jpg', np.full((6000, 8000, 3), 235, np.uint8))
+    
+    quality, ocr_result = processor.process_document(buf.tobytes(), 'pan')
+    
+    assert not quality['valid']
+    assert 'blank' in quality['reason']
+    assert ocr_result is None
+
+
+def _with_ocr_text(processor, monkeypatch, text: str):
+    monkeypatch.setattr(processor, 'extract_text_generic',
+                        lambda file_content, img=None: {'status': 'success', 'raw_text': text})
+
+
+def test_aadhaar_number_after_text_date(processor, monkeypatch):
+    _with_ocr_text(processor, monkeypatch, 'DOB 12 Jan 2345 6789 0123')
+    
+    fields = processor.extract_aadhaar_specific(b'')['extracted_fields']
+    
+    assert fields['aadhaar_number'] == '2345 6789 0123'
+    assert fields['dob'] == '12 Jan 2345'
+
+
+def test_aadhaar_number_after_address_words(processor, monkeypatch):
+    _with_ocr_text(processor, monkeypatch, 'Flat 21 Block 1234 5678 9012')
+    
+    fields = processor.extract_aadhaar_specific(b'')['extracted_fields']
+    
+    assert fields['aadhaar_number'] == '1234 5678 9012'
+    assert fields['dob'] == '21 Block 1234'
+
+
+def test_dob_format_preference(processor):
+    assert processor._extract_dob_from_text('15 March 1990 15/03/1990') == '15/03/1990'
+    assert processor._extract_dob_from_text('15 March 1990 1990-03-15') == '1990-03-15'
+    assert processor._extract_dob_from_text('no date here') is None
+
+
+def test_pan_and_passport_numbers(processor, monkeypatch):
+    _with_ocr_text(processor, monkeypatch, 'INCOME TAX DEPARTMENT ABCDE1234F 01/01/1990')
+    assert processor.extract_pan_specific(b'')['extracted_fields']['pan_number'] == 'ABCDE1234F'
+    
+    _with_ocr_text(processor, monkeypatch, 'REPUBLIC OF INDIA J8369854')
+    assert processor.extract_passport_specific(b'')['extracted_fields']['passport_number'] == 'J8369854'
+
+
+def test_validate_document_quality_large_sparse_text_jpeg(processor):
+    quality = processor.validate_document_quality(_sparse_text_jpeg(8000, 6000, 4))
+    
+    assert quality['valid'], quality['reason']
+    assert quality['details']['contrast'] >= 5
+    assert quality['details']['size'] == (8000, 6000)
+    # Colour JPEGs are reported as colour
+    assert quality['details']['channels'] == 3
+
+
+class _FakeGpuMat:
+    """Host-backed stand-in for cv2.cuda_GpuMat"""
+    
+    def __init__(self, data=None):
+        self.data = data
+    
+    def upload(self, data):
+        self.data = data
+    
+    def download(self):
+        return self.data
+
+
+def _fake_cuda(monkeypatch, mean_std_dev):
+    import ocr_processor
+    
+    monkeypatch.setattr(ocr_processor, '_CUDA_AVAILABLE', True)
+    monkeypatch.setattr(cv2, 'cuda_GpuMat', _FakeGpuMat)
+    monkeypatch.setattr(cv2.cuda, 'cvtColor',
+                        lambda gpu_img, code: _FakeGpuMat(cv2.cvtColor(gpu_img.data, code)),
+                        raising=False)
+    monkeypatch.setattr(cv2.cuda, 'meanStdDev', mean_std_dev, raising=False)
+
+
+def _stats_image():
+    rng = np.random.default_rng(0)
+    return rng.integers(40, 200, size=(300, 400, 3), dtype=np.uint8)
+
+
+@pytest.mark.parametrize('result_shape', ['tuple', 'gpumat', 'ndarray'])
+def test_gray_stats_gpu_result_shapes(processor, monkeypatch, result_shape):
+    def mean_std_dev(gpu_gray):
+        mean, std_dev = cv2.meanStdDev(gpu_gray.data)
+        if result_shape == 'tuple':
+            return mean, std_dev
+        stats = np.array([[mean[0, 0], std_dev[0, 0]]])
+        return _FakeGpuMat(stats) if result_shape == 'gpumat' else stats
+    
+    _fake_cuda(monkeypatch, mean_std_dev)
+    processor.use_gpu = True
+    img = _stats_image()
+    gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
+    
+    mean, std_dev = processor._gray_stats(img)
+    
+    assert mean == pytest.approx(float(gray.mean()))
+    assert std_dev == pytest.approx(float(gray.std()))
+
+
+@pytest.mark.parametrize('mean_std_dev', [
+    lambda gpu_gray: np.zeros((1, 1)),
+    lambda gpu_gray: None,
+    lambda gpu_gray: (_ for _ in ()).throw(cv2.error('no device'))
+])
+def test_gray_stats_gpu_failure_falls_back_to_cpu(processor, monkeypatch, mean_std_dev):
+    img = _stats_image()
+    expected = processor._gray_stats(img)
+    
+    _fake_cuda(monkeypatch, mean_std_dev)
+    processor.use_gpu = True
+    
+    assert processor._gray_stats(img) == expected
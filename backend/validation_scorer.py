@@ -1,9 +1,89 @@
 # validation_scorer.py - Validation & Risk Scoring Module
-from typing import Dict, List, Optional, Tuple
-from datetime import datetime, timedelta
+from typing import Any, ClassVar, Dict, List, Optional, Tuple, Union
+from datetime import date, datetime, timedelta
 from enum import Enum
+import io
+import os
 import re
-from difflib import SequenceMatcher
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from rapidfuzz import fuzz
+
+# Format patterns used by the validation helpers
+_EMAIL_RE = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
+_NONDIGIT_RE = re.compile(r'\D')
+# Every byte except ASCII 0-9, for deleting non-digits with bytes.translate
+_NON_DIGIT_BYTES = bytes(c for c in range(256) if not 48 <= c <= 57)
+_PAN_RE = re.compile(r'^[A-Z]{5}[0-9]{4}[A-Z]$')
+_REPEAT_RE = re.compile(r'(.)\1{2,}')
+# Placeholder values typed into test/dummy submissions; the bytes form
+# scans ASCII values lowercased through _ASCII_LOWER
+_TEST_KW_RE = re.compile(r'test|dummy|sample|xxx|example', re.IGNORECASE)
+_TEST_KW_BYTES_RE = re.compile(rb'test|dummy|sample|xxx|example')
+_ASCII_LOWER = bytes.maketrans(bytes(range(65, 91)), bytes(range(97, 123)))
+
+# Fields every onboarding form must fill, and documents every case must upload
+# (ordered tuples for reporting, frozensets for the set arithmetic)
+_REQUIRED_FORM_FIELDS = ('customer_name', 'dob', 'address')
+_REQUIRED_DOCS = ('pan', 'aadhaar')
+_REQUIRED_FORM_SET = frozenset(_REQUIRED_FORM_FIELDS)
+_REQUIRED_DOCS_SET = frozenset(_REQUIRED_DOCS)
+
+# Score penalty per anomaly severity
+_SEVERITY_WEIGHTS = {
+    'low': 5,
+    'medium': 15,
+    'high': 30
+}
+
+# Report layout
+_HEAVY_RULE = "=" * 60
+_RULE = "-" * 60
+_CATEGORY_LABELS = {
+    category: category.replace('_', ' ').title()
+    for category in (
+        'data_match', 'document_quality', 'completeness',
+        'consistency', 'format_validation', 'anomaly_count'
+    )
+}
+
+def _parse_dob(value: str) -> date:
+    """Parse a DOB the way strptime('%Y-%m-%d') does (ValueError if it cannot)"""
+    # fromisoformat is the C fast path for the canonical zero-padded form;
+    # strptime also takes unpadded parts such as '1990-6-15'
+    if len(value) == 10 and value[4] == value[7] == '-':
+        try:
+            return date.fromisoformat(value)
+        except ValueError:
+            pass
+    return datetime.strptime(value, '%Y-%m-%d').date()
+
+def _years_before(day: date, years: int) -> date:
+    """Same calendar day `years` earlier (Feb 29 falls back to Feb 28)"""
+    try:
+        return day.replace(year=day.year - years)
+    except ValueError:
+        return day.replace(year=day.year - years, day=28)
+
+@lru_cache(maxsize=2048)
+def _similarity(str1: str, str2: str) -> float:
+    """Similarity (0-1) of two already-lowercased strings, memoized"""
+    return fuzz.ratio(str1, str2) / 100.0
+
+def _digits_only(value: str) -> str:
+    """value with all non-digit characters removed"""
+    if value.isascii():
+        return value.encode('ascii').translate(None, _NON_DIGIT_BYTES).decode('ascii')
+    # Unicode digits and separators need the regex
+    return _NONDIGIT_RE.sub('', value)
+
+def _has_test_keyword(value: str) -> bool:
+    """Whether value contains a test/dummy keyword, in any letter case"""
+    if value.isascii():
+        # Case-sensitive bytes scan keeps the regex literal-prefix fast path
+        return _TEST_KW_BYTES_RE.search(value.encode('ascii').translate(_ASCII_LOWER)) is not None
+    return _TEST_KW_RE.search(value) is not None
 
 class RiskLevel(str, Enum):
     """Risk levels for KYC assessment"""
@@ -23,14 +103,77 @@ class AnomalyType(str, Enum):
     DOCUMENT_QUALITY = "DOCUMENT_QUALITY"
     DUPLICATE_ENTRY = "DUPLICATE_ENTRY"
 
+# Skeleton of every validation result; the mutable members are renewed per copy
+_RESULT_PROTOTYPE = {
+    'is_valid': True,
+    'risk_score': 0,
+    'risk_level': RiskLevel.LOW,
+    'anomalies': [],
+    'validations': {},
+    'recommendations': [],
+    'scores_breakdown': {}
+}
+
+class DataMatchResult:
+    """OCR extracted fields compared with form data"""
+    _fields: ClassVar[Tuple[str, ...]] = ('score', 'matches', 'mismatches', 'missing_in_ocr')
+    __slots__ = _fields
+    
+    def __init__(self) -> None:
+        self.score = 100
+        self.matches: List[Dict] = []
+        self.mismatches: List[Dict] = []
+        self.missing_in_ocr: List[str] = []
+
+class DocumentQualityResult:
+    """OCR confidence and quality checks of the uploaded documents"""
+    _fields: ClassVar[Tuple[str, ...]] = ('score', 'documents', 'issues')
+    __slots__ = _fields
+    
+    def __init__(self) -> None:
+        self.score = 100
+        self.documents: Dict[str, Dict] = {}
+        self.issues: List[str] = []
+
+class CompletenessResult:
+    """Required form fields and documents"""
+    _fields: ClassVar[Tuple[str, ...]] = ('score', 'required_fields', 'missing_fields', 'empty_fields')
+    __slots__ = _fields
+    
+    def __init__(self) -> None:
+        self.score = 100
+        self.required_fields: List[str] = []
+        self.missing_fields: List[str] = []
+        self.empty_fields: List[str] = []
+
+class ConsistencyResult:
+    """Internal consistency of the submitted data"""
+    _fields: ClassVar[Tuple[str, ...]] = ('score', 'consistent_fields', 'inconsistencies')
+    __slots__ = _fields
+    
+    def __init__(self) -> None:
+        self.score = 100
+        self.consistent_fields: List[str] = []
+        self.inconsistencies: List[Dict] = []
+
+class FormatResult:
+    """Format checks of contact details and document numbers"""
+    _fields: ClassVar[Tuple[str, ...]] = ('score', 'valid_formats', 'invalid_formats')
+    __slots__ = _fields
+    
+    def __init__(self) -> None:
+        self.score = 100
+        self.valid_formats: List[str] = []
+        self.invalid_formats: List[Dict] = []
+
 class ValidationRiskScorer:
     """
     Comprehensive validation and risk scoring for KYC onboarding
     """
     
-    def __init__(self):
+    def __init__(self) -> None:
         # Risk scoring weights
-        self.weights = {
+        self.weights: Dict[str, float] = {
             'data_match': 0.25,           # How well OCR matches form
             'document_quality': 0.15,      # Quality of uploaded documents
             'completeness': 0.20,          # All required fields present
@@ -38,15 +181,28 @@ class ValidationRiskScorer:
             'format_validation': 0.10,     # Format correctness
             'anomaly_count': 0.10          # Number of anomalies
         }
+        # (category, weight) pairs, in the order the risk score sums them
+        self._weight_items = tuple(self.weights.items())
         
         # Thresholds for risk assessment
-        self.thresholds = {
+        self.thresholds: Dict[str, Union[int, float]] = {
             'min_data_match': 0.75,
             'min_ocr_confidence': 0.70,
             'max_age': 100,
             'min_age': 18,
             'max_anomalies': 3
         }
+        
+        self._refresh_age_bounds()
+    
+    def _refresh_age_bounds(self) -> None:
+        """
+        Pin today's date and the range of birth dates allowed by the age thresholds
+        """
+        self._today = date.today()
+        # Oldest DOB still under max_age + 1 years, youngest DOB already min_age
+        self._min_dob = _years_before(self._today, int(self.thresholds['max_age']) + 1) + timedelta(days=1)
+        self._max_dob = _years_before(self._today, int(self.thresholds['min_age']))
     
     def validate_and_score(
         self, 
@@ -65,44 +221,43 @@ class ValidationRiskScorer:
         Returns:
             Complete validation and risk assessment
         """
-        # Initialize results
-        validation_result = {
-            'is_valid': True,
-            'risk_score': 0,
-            'risk_level': RiskLevel.LOW,
-            'anomalies': [],
-            'validations': {},
-            'recommendations': [],
-            'scores_breakdown': {}
-        }
-        
-        # 1. Compare extracted fields with form data
-        data_match_result = self._compare_extracted_fields(form_data, ocr_results)
-        validation_result['validations']['data_match'] = data_match_result
-        validation_result['scores_breakdown']['data_match'] = data_match_result['score']
-        
-        # 2. Check document quality
-        quality_result = self._check_document_quality(ocr_results)
-        validation_result['validations']['document_quality'] = quality_result
-        validation_result['scores_breakdown']['document_quality'] = quality_result['score']
+        # One reference date for every age check in this call
+        self._refresh_age_bounds()
         
-        # 3. Validate completeness
+        # Required fields and documents first, so hopeless cases skip the other checks
         completeness_result = self._validate_completeness(form_data, ocr_results)
-        validation_result['validations']['completeness'] = completeness_result
-        validation_result['scores_breakdown']['completeness'] = completeness_result['score']
+        reject_reason = self._fast_reject_reason(ocr_results, completeness_result)
+        if reject_reason:
+            return self._rejected_result(reject_reason, completeness_result)
         
-        # 4. Check internal consistency
-        consistency_result = self._check_consistency(form_data, ocr_results)
-        validation_result['validations']['consistency'] = consistency_result
-        validation_result['scores_breakdown']['consistency'] = consistency_result['score']
-        
-        # 5. Validate data formats
-        format_result = self._validate_formats(form_data, ocr_results)
-        validation_result['validations']['format_validation'] = format_result
-        validation_result['scores_breakdown']['format_validation'] = format_result['score']
-        
-        # 6. Detect anomalies
-        anomalies = self._detect_anomalies(form_data, ocr_results, validation_result)
+        # Initialize results
+        validation_result = self._new_validation_result()
+        
+        # First non-empty value of each extracted field across documents
+        ocr_fields = self._merge_ocr_fields(ocr_results)
+        
+        # 1-5. Run the checks. Each records its anomalies as it finds them, so the
+        # checks run in anomaly order: missing fields, mismatches, formats, age
+        # (from the consistency check), document quality
+        anomalies = self._missing_field_anomalies(completeness_result)
+        data_match_result = self._compare_extracted_fields(form_data, ocr_results, ocr_fields, anomalies)
+        format_result = self._validate_formats(form_data, ocr_fields, anomalies)
+        consistency_result = self._check_consistency(form_data, ocr_results, anomalies)
+        quality_result = self._check_document_quality(ocr_results, anomalies)
+        
+        sub_results = (
+            ('data_match', data_match_result),
+            ('document_quality', quality_result),
+            ('completeness', completeness_result),
+            ('consistency', consistency_result),
+            ('format_validation', format_result)
+        )
+        for name, sub_result in sub_results:
+            validation_result['validations'][name] = sub_result
+            validation_result['scores_breakdown'][name] = sub_result.score
+        
+        # 6. Suspicious patterns complete the anomalies
+        anomalies.extend(self._detect_suspicious_patterns(form_data, ocr_results))
         validation_result['anomalies'] = anomalies
         validation_result['scores_breakdown']['anomaly_count'] = self._score_anomalies(anomalies)
         
@@ -117,22 +272,115 @@ class ValidationRiskScorer:
         # 9. Determine if validation passed
         validation_result['is_valid'] = self._is_validation_passed(validation_result)
         
+        # Sub-results leave as plain dicts, ready for storage and the API response
+        validation_result['validations'] = self._validations_as_dicts(validation_result['validations'])
+        
         return validation_result
     
-    def _compare_extracted_fields(self, form_data: Dict, ocr_results: Dict) -> Dict:
+    def validate_and_score_batch(
+        self,
+        cases: List[Tuple[Dict, Dict]],
+        max_workers: Optional[int] = None
+    ) -> List[Dict]:
+        """
+        Validate and score many cases, spread over worker processes
+        
+        Args:
+            cases: (form_data, ocr_results) pairs
+            max_workers: Number of worker processes (defaults to the CPU count)
+            
+        Returns:
+            Validation and risk assessments, in the order of cases
+        """
+        workers = min(max_workers or os.cpu_count() or 1, len(cases))
+        if workers <= 1:
+            return [self.validate_and_score(form_data, ocr_results) for form_data, ocr_results in cases]
+        
+        form_batch = [form_data for form_data, _ in cases]
+        ocr_batch = [ocr_results for _, ocr_results in cases]
+        chunksize = max(1, len(cases) // (4 * workers))
+        
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(self.validate_and_score, form_batch, ocr_batch, chunksize=chunksize))
+    
+    def _fast_reject_reason(self, ocr_results: Dict, completeness: CompletenessResult) -> Optional[str]:
+        """
+        Reason to reject a case without further checks, or None
+        """
+        if not ocr_results:
+            return 'No documents uploaded'
+        
+        unfilled = set(completeness.missing_fields) | set(completeness.empty_fields)
+        if unfilled.issuperset(_REQUIRED_FORM_FIELDS):
+            return 'No required form fields provided'
+        
+        return None
+    
+    def _rejected_result(self, reason: str, completeness: CompletenessResult) -> Dict:
         """
-        Compare OCR extracted fields with form data
+        Canonical very-high-risk result for a case rejected up front
         """
-        result = {
-            'score': 100,
-            'matches': [],
-            'mismatches': [],
-            'missing_in_ocr': []
+        validation_result = self._new_validation_result()
+        validation_result['is_valid'] = False
+        validation_result['risk_score'] = 100
+        validation_result['risk_level'] = RiskLevel.VERY_HIGH
+        validation_result['anomalies'] = self._missing_field_anomalies(completeness)
+        validation_result['validations']['completeness'] = completeness
+        validation_result['scores_breakdown']['completeness'] = completeness.score
+        validation_result['rejection_reason'] = reason
+        
+        validation_result['recommendations'] = self._generate_recommendations(validation_result)
+        validation_result['validations'] = self._validations_as_dicts(validation_result['validations'])
+        return validation_result
+    
+    def _new_validation_result(self) -> Dict:
+        """
+        Fresh validation result copied from the module prototype
+        """
+        validation_result = _RESULT_PROTOTYPE.copy()
+        validation_result['anomalies'] = []
+        validation_result['validations'] = {}
+        validation_result['recommendations'] = []
+        validation_result['scores_breakdown'] = {}
+        return validation_result
+    
+    def _validations_as_dicts(self, validations: Dict) -> Dict[str, Dict]:
+        """
+        Convert the slotted sub-results to plain dicts (shallow: the
+        sub-results are discarded afterwards, so their lists and dicts are
+        handed over rather than deep-copied)
+        """
+        return {
+            name: {field: getattr(sub_result, field) for field in sub_result._fields}
+            for name, sub_result in validations.items()
         }
+    
+    def _merge_ocr_fields(self, ocr_results: Dict) -> Dict:
+        """
+        Merge extracted fields of all documents, keeping the first non-empty value per field
+        """
+        merged: Dict = {}
+        for doc_data in (ocr_results or {}).values():
+            for field, value in doc_data.get('extracted_fields', {}).items():
+                if value and field not in merged:
+                    merged[field] = value
+        return merged
+    
+    def _compare_extracted_fields(
+        self,
+        form_data: Dict,
+        ocr_results: Dict,
+        ocr_fields: Dict,
+        anomalies: List[Dict]
+    ) -> DataMatchResult:
+        """
+        Compare OCR extracted fields with form data, recording mismatch anomalies
+        """
+        result = DataMatchResult()
         
         if not ocr_results:
-            result['score'] = 0
-            result['missing_in_ocr'] = ['All fields']
+            result.score = 0
+            result.missing_in_ocr = ['All fields']
             return result
         
         # Fields to compare
@@ -149,22 +397,17 @@ class ValidationRiskScorer:
             form_value = form_data.get(form_field, '')
             
             # Get OCR value from any document
-            ocr_value = None
-            for doc_type, doc_data in ocr_results.items():
-                if 'extracted_fields' in doc_data:
-                    ocr_value = doc_data['extracted_fields'].get(ocr_field)
-                    if ocr_value:
-                        break
+            ocr_value = ocr_fields.get(ocr_field)
             
             if not ocr_value:
-                result['missing_in_ocr'].append(ocr_field)
+                result.missing_in_ocr.append(ocr_field)
                 continue
             
             # Calculate similarity
             similarity = self._calculate_similarity(str(form_value), str(ocr_value))
             
             if similarity >= 0.8:
-                result['matches'].append({
+                result.matches.append({
                     'field': ocr_field,
                     'form_value': form_value,
                     'ocr_value': ocr_value,
@@ -172,39 +415,43 @@ class ValidationRiskScorer:
                 })
                 matched_fields += 1
             else:
-                result['mismatches'].append({
+                result.mismatches.append({
                     'field': ocr_field,
                     'form_value': form_value,
                     'ocr_value': ocr_value,
                     'similarity': similarity
                 })
+                anomalies.append({
+                    'type': AnomalyType.MISMATCH,
+                    'field': ocr_field,
+                    'severity': 'high' if similarity < 0.5 else 'medium',
+                    'description': f"Mismatch: Form='{form_value}' vs OCR='{ocr_value}'",
+                    'similarity': similarity
+                })
         
         # Calculate score
         if total_fields > 0:
-            result['score'] = int((matched_fields / total_fields) * 100)
+            result.score = int((matched_fields / total_fields) * 100)
         
         return result
     
-    def _check_document_quality(self, ocr_results: Dict) -> Dict:
+    def _check_document_quality(self, ocr_results: Dict, anomalies: List[Dict]) -> DocumentQualityResult:
         """
-        Check quality of uploaded documents
+        Check quality of uploaded documents, recording an anomaly per issue
         """
-        result = {
-            'score': 100,
-            'documents': {},
-            'issues': []
-        }
+        result = DocumentQualityResult()
         
         if not ocr_results:
-            result['score'] = 0
-            result['issues'].append('No documents uploaded')
+            result.score = 0
+            result.issues.append('No documents uploaded')
+            anomalies.append(self._quality_anomaly('No documents uploaded'))
             return result
         
-        total_confidence = 0
+        total_confidence = 0.0
         doc_count = 0
         
         for doc_type, doc_data in ocr_results.items():
-            doc_result = {
+            doc_result: Dict[str, Any] = {
                 'confidence': 0,
                 'quality_check': None,
                 'issues': []
@@ -228,79 +475,83 @@ class ValidationRiskScorer:
                 if not quality.get('valid', True):
                     doc_result['issues'].append(f"Quality issue: {quality.get('reason', 'Unknown')}")
             
-            result['documents'][doc_type] = doc_result
-            result['issues'].extend(doc_result['issues'])
+            result.documents[doc_type] = doc_result
+            result.issues.extend(doc_result['issues'])
+            anomalies.extend(self._quality_anomaly(issue) for issue in doc_result['issues'])
         
         # Calculate overall quality score
         if doc_count > 0:
             avg_confidence = total_confidence / doc_count
-            result['score'] = int(avg_confidence * 100)
+            result.score = int(avg_confidence * 100)
         
         return result
     
-    def _validate_completeness(self, form_data: Dict, ocr_results: Dict) -> Dict:
+    def _validate_completeness(self, form_data: Dict, ocr_results: Dict) -> CompletenessResult:
         """
         Check if all required fields are present
         """
-        result = {
-            'score': 100,
-            'required_fields': [],
-            'missing_fields': [],
-            'empty_fields': []
-        }
+        result = CompletenessResult()
         
-        # Required fields in form
-        required_form_fields = ['customer_name', 'dob', 'address']
+        result.required_fields = list(_REQUIRED_FORM_FIELDS)
         
-        for field in required_form_fields:
-            result['required_fields'].append(field)
-            
-            if field not in form_data:
-                result['missing_fields'].append(field)
-            elif not form_data[field] or str(form_data[field]).strip() == '':
-                result['empty_fields'].append(field)
+        # Required fields in form; walk the ordered tuple only if some are unfilled
+        filled = {
+            field for field, value in form_data.items()
+            if value and (not isinstance(value, str) or value.strip())
+        }
+        unfilled = _REQUIRED_FORM_SET - filled
+        if unfilled:
+            for field in _REQUIRED_FORM_FIELDS:
+                if field in unfilled:
+                    if field in form_data:
+                        result.empty_fields.append(field)
+                    else:
+                        result.missing_fields.append(field)
         
         # Required documents
-        required_docs = ['pan', 'aadhaar']
-        
-        for doc in required_docs:
-            if doc not in ocr_results or not ocr_results[doc]:
-                result['missing_fields'].append(f'{doc}_document')
+        uploaded = {doc for doc, doc_data in ocr_results.items() if doc_data}
+        missing_docs = _REQUIRED_DOCS_SET - uploaded
+        if missing_docs:
+            for doc in _REQUIRED_DOCS:
+                if doc in missing_docs:
+                    result.missing_fields.append(f'{doc}_document')
         
         # Calculate score
-        total_required = len(required_form_fields) + len(required_docs)
-        missing_count = len(result['missing_fields']) + len(result['empty_fields'])
+        total_required = len(_REQUIRED_FORM_FIELDS) + len(_REQUIRED_DOCS)
+        missing_count = len(result.missing_fields) + len(result.empty_fields)
         
         if total_required > 0:
-            result['score'] = int(((total_required - missing_count) / total_required) * 100)
+            result.score = int(((total_required - missing_count) / total_required) * 100)
         
         return result
     
-    def _check_consistency(self, form_data: Dict, ocr_results: Dict) -> Dict:
+    def _check_consistency(self, form_data: Dict, ocr_results: Dict, anomalies: List[Dict]) -> ConsistencyResult:
         """
-        Check internal consistency of data
+        Check internal consistency of data, recording an age anomaly
         """
-        result = {
-            'score': 100,
-            'consistent_fields': [],
-            'inconsistencies': []
-        }
+        result = ConsistencyResult()
         
         # Check age consistency
         dob = form_data.get('dob')
         if dob:
             age_check = self._validate_age(dob)
             if age_check['valid']:
-                result['consistent_fields'].append('age')
+                result.consistent_fields.append('age')
             else:
-                result['inconsistencies'].append({
+                result.inconsistencies.append({
                     'field': 'age',
                     'issue': age_check['reason']
                 })
+                anomalies.append({
+                    'type': AnomalyType.AGE_INCONSISTENCY,
+                    'field': 'dob',
+                    'severity': 'high',
+                    'description': age_check['reason']
+                })
         
         # Check name consistency across documents
         if ocr_results:
-            names = []
+            names: List[str] = []
             for doc_type, doc_data in ocr_results.items():
                 if 'extracted_fields' in doc_data and 'name' in doc_data['extracted_fields']:
                     names.append(doc_data['extracted_fields']['name'])
@@ -311,7 +562,7 @@ class ValidationRiskScorer:
                 for name in names[1:]:
                     similarity = self._calculate_similarity(base_name, name)
                     if similarity < 0.7:
-                        result['inconsistencies'].append({
+                        result.inconsistencies.append({
                             'field': 'name',
                             'issue': f'Name mismatch across documents: {base_name} vs {name}'
                         })
@@ -319,167 +570,116 @@ class ValidationRiskScorer:
         # Check address format consistency
         address = form_data.get('address', '')
         if address and len(address) < 20:
-            result['inconsistencies'].append({
+            result.inconsistencies.append({
                 'field': 'address',
                 'issue': 'Address too short (minimum 20 characters)'
             })
         
         # Calculate score
-        total_checks = len(result['consistent_fields']) + len(result['inconsistencies'])
+        total_checks = len(result.consistent_fields) + len(result.inconsistencies)
         if total_checks > 0:
-            result['score'] = int((len(result['consistent_fields']) / total_checks) * 100)
+            result.score = int((len(result.consistent_fields) / total_checks) * 100)
         
         return result
     
-    def _validate_formats(self, form_data: Dict, ocr_results: Dict) -> Dict:
+    def _validate_formats(self, form_data: Dict, ocr_fields: Dict, anomalies: List[Dict]) -> FormatResult:
         """
-        Validate data format correctness
+        Validate data format correctness, recording invalid-format anomalies
         """
-        result = {
-            'score': 100,
-            'valid_formats': [],
-            'invalid_formats': []
-        }
+        result = FormatResult()
         
         # Validate email format
         email = form_data.get('email')
         if email:
             if self._is_valid_email(email):
-                result['valid_formats'].append('email')
+                result.valid_formats.append('email')
             else:
-                result['invalid_formats'].append({
-                    'field': 'email',
-                    'value': email,
-                    'issue': 'Invalid email format'
-                })
+                self._add_invalid_format(result, anomalies, 'email', email, 'Invalid email format')
         
         # Validate phone format
         phone = form_data.get('phone')
         if phone:
             if self._is_valid_phone(phone):
-                result['valid_formats'].append('phone')
+                result.valid_formats.append('phone')
             else:
-                result['invalid_formats'].append({
-                    'field': 'phone',
-                    'value': phone,
-                    'issue': 'Invalid phone format'
-                })
+                self._add_invalid_format(result, anomalies, 'phone', phone, 'Invalid phone format')
         
         # Validate PAN format from OCR
-        if ocr_results:
-            for doc_type, doc_data in ocr_results.items():
-                if 'extracted_fields' in doc_data:
-                    pan = doc_data['extracted_fields'].get('pan')
-                    if pan:
-                        if self._is_valid_pan(pan):
-                            result['valid_formats'].append('pan')
-                        else:
-                            result['invalid_formats'].append({
-                                'field': 'pan',
-                                'value': pan,
-                                'issue': 'Invalid PAN format'
-                            })
-                        break
+        pan = ocr_fields.get('pan')
+        if pan:
+            if self._is_valid_pan(pan):
+                result.valid_formats.append('pan')
+            else:
+                self._add_invalid_format(result, anomalies, 'pan', pan, 'Invalid PAN format')
         
         # Validate Aadhaar format from OCR
-        if ocr_results:
-            for doc_type, doc_data in ocr_results.items():
-                if 'extracted_fields' in doc_data:
-                    aadhaar = doc_data['extracted_fields'].get('aadhaar')
-                    if aadhaar:
-                        if self._is_valid_aadhaar(aadhaar):
-                            result['valid_formats'].append('aadhaar')
-                        else:
-                            result['invalid_formats'].append({
-                                'field': 'aadhaar',
-                                'value': aadhaar,
-                                'issue': 'Invalid Aadhaar format'
-                            })
-                        break
+        aadhaar = ocr_fields.get('aadhaar')
+        if aadhaar:
+            if self._is_valid_aadhaar(aadhaar):
+                result.valid_formats.append('aadhaar')
+            else:
+                self._add_invalid_format(result, anomalies, 'aadhaar', aadhaar, 'Invalid Aadhaar format')
         
         # Calculate score
-        total_checks = len(result['valid_formats']) + len(result['invalid_formats'])
+        total_checks = len(result.valid_formats) + len(result.invalid_formats)
         if total_checks > 0:
-            result['score'] = int((len(result['valid_formats']) / total_checks) * 100)
+            result.score = int((len(result.valid_formats) / total_checks) * 100)
         
         return result
     
-    def _detect_anomalies(
-        self, 
-        form_data: Dict, 
-        ocr_results: Dict,
-        validation_result: Dict
-    ) -> List[Dict]:
+    def _missing_field_anomalies(self, completeness: CompletenessResult) -> List[Dict]:
         """
-        Detect various types of anomalies
+        One high-severity anomaly per missing required field or document
         """
-        anomalies = []
-        
-        # 1. Missing fields anomalies
-        completeness = validation_result['validations'].get('completeness', {})
-        for field in completeness.get('missing_fields', []):
-            anomalies.append({
+        return [
+            {
                 'type': AnomalyType.MISSING_FIELD,
                 'field': field,
                 'severity': 'high',
                 'description': f'Required field "{field}" is missing'
-            })
-        
-        # 2. Data mismatch anomalies
-        data_match = validation_result['validations'].get('data_match', {})
-        for mismatch in data_match.get('mismatches', []):
-            severity = 'high' if mismatch['similarity'] < 0.5 else 'medium'
-            anomalies.append({
-                'type': AnomalyType.MISMATCH,
-                'field': mismatch['field'],
-                'severity': severity,
-                'description': f"Mismatch: Form='{mismatch['form_value']}' vs OCR='{mismatch['ocr_value']}'",
-                'similarity': mismatch['similarity']
-            })
-        
-        # 3. Format validation anomalies
-        format_val = validation_result['validations'].get('format_validation', {})
-        for invalid in format_val.get('invalid_formats', []):
-            anomalies.append({
-                'type': AnomalyType.INVALID_FORMAT,
-                'field': invalid['field'],
-                'severity': 'medium',
-                'description': invalid['issue']
-            })
-        
-        # 4. Age consistency anomalies
-        dob = form_data.get('dob')
-        if dob:
-            age_check = self._validate_age(dob)
-            if not age_check['valid']:
-                anomalies.append({
-                    'type': AnomalyType.AGE_INCONSISTENCY,
-                    'field': 'dob',
-                    'severity': 'high',
-                    'description': age_check['reason']
-                })
-        
-        # 5. Document quality anomalies
-        quality = validation_result['validations'].get('document_quality', {})
-        for issue in quality.get('issues', []):
-            anomalies.append({
-                'type': AnomalyType.DOCUMENT_QUALITY,
-                'field': 'document',
-                'severity': 'medium',
-                'description': issue
-            })
-        
-        # 6. Suspicious patterns
-        suspicious = self._detect_suspicious_patterns(form_data, ocr_results)
-        anomalies.extend(suspicious)
-        
-        return anomalies
+            }
+            for field in completeness.missing_fields
+        ]
+    
+    def _add_invalid_format(
+        self,
+        result: FormatResult,
+        anomalies: List[Dict],
+        field: str,
+        value: str,
+        issue: str
+    ) -> None:
+        """
+        Record an invalid field format and its anomaly
+        """
+        result.invalid_formats.append({
+            'field': field,
+            'value': value,
+            'issue': issue
+        })
+        anomalies.append({
+            'type': AnomalyType.INVALID_FORMAT,
+            'field': field,
+            'severity': 'medium',
+            'description': issue
+        })
+    
+    def _quality_anomaly(self, issue: str) -> Dict:
+        """
+        Anomaly for one document quality issue
+        """
+        return {
+            'type': AnomalyType.DOCUMENT_QUALITY,
+            'field': 'document',
+            'severity': 'medium',
+            'description': issue
+        }
     
     def _detect_suspicious_patterns(self, form_data: Dict, ocr_results: Dict) -> List[Dict]:
         """
         Detect suspicious patterns in data
         """
-        suspicious = []
+        suspicious: List[Dict] = []
         
         # Check for repeated characters in name
         name = form_data.get('customer_name', '')
@@ -492,10 +692,9 @@ class ValidationRiskScorer:
             })
         
         # Check for test/dummy data
-        test_keywords = ['test', 'dummy', 'sample', 'xxx', 'example']
         for field, value in form_data.items():
             if isinstance(value, str):
-                if any(keyword in value.lower() for keyword in test_keywords):
+                if _has_test_keyword(value):
                     suspicious.append({
                         'type': AnomalyType.SUSPICIOUS_PATTERN,
                         'field': field,
@@ -516,13 +715,11 @@ class ValidationRiskScorer:
         """
         Calculate overall risk score (0-100, higher = more risky)
         """
-        risk_score = 0
-        
-        for category, weight in self.weights.items():
-            category_score = scores_breakdown.get(category, 0)
-            # Invert score (100 - score) because higher validation score = lower risk
-            risk_component = (100 - category_score) * weight
-            risk_score += risk_component
+        # Invert score (100 - score) because higher validation score = lower risk
+        risk_score = sum(
+            (100 - scores_breakdown.get(category, 0)) * weight
+            for category, weight in self._weight_items
+        )
         
         return int(risk_score)
     
@@ -533,14 +730,12 @@ class ValidationRiskScorer:
         if not anomalies:
             return 100
         
-        # Weight anomalies by severity
-        severity_weights = {
-            'low': 5,
-            'medium': 15,
-            'high': 30
-        }
-        
-        total_weight = sum(severity_weights.get(a.get('severity', 'medium'), 15) for a in anomalies)
+        # Weight anomalies by severity, once per distinct severity
+        severity_counts = Counter(a.get('severity', 'medium') for a in anomalies)
+        total_weight = sum(
+            _SEVERITY_WEIGHTS.get(severity, 15) * count
+            for severity, count in severity_counts.items()
+        )
         
         # Cap at 100
         score = max(0, 100 - total_weight)
@@ -565,7 +760,7 @@ class ValidationRiskScorer:
         """
         Generate recommendations based on validation results
         """
-        recommendations = []
+        recommendations: List[str] = []
         
         risk_level = validation_result['risk_level']
         anomalies = validation_result['anomalies']
@@ -587,20 +782,21 @@ class ValidationRiskScorer:
         if high_severity_count > 0:
             recommendations.append(f'Address {high_severity_count} high-severity anomalies before approval')
         
+        validations = validation_result['validations']
+        
         # Data match recommendations
-        data_match = validation_result['validations'].get('data_match', {})
-        if data_match.get('score', 100) < 80:
+        data_match = validations.get('data_match')
+        if data_match is not None and data_match.score < 80:
             recommendations.append('Re-upload documents with better quality for accurate OCR')
         
         # Completeness recommendations
-        completeness = validation_result['validations'].get('completeness', {})
-        missing = completeness.get('missing_fields', [])
+        missing = validations['completeness'].missing_fields
         if missing:
             recommendations.append(f'Complete missing fields: {", ".join(missing)}')
         
         # Document quality recommendations
-        quality = validation_result['validations'].get('document_quality', {})
-        if quality.get('score', 100) < 70:
+        quality = validations.get('document_quality')
+        if quality is not None and quality.score < 70:
             recommendations.append('Request higher quality document scans')
         
         return recommendations
@@ -627,8 +823,7 @@ class ValidationRiskScorer:
             return False
         
         # Completeness check
-        completeness = validation_result['validations'].get('completeness', {})
-        if completeness.get('score', 0) < 80:
+        if validation_result['validations']['completeness'].score < 80:
             return False
         
         return True
@@ -636,25 +831,28 @@ class ValidationRiskScorer:
     # Helper methods
     def _calculate_similarity(self, str1: str, str2: str) -> float:
         """Calculate similarity between two strings"""
-        return SequenceMatcher(None, str1.lower(), str2.lower()).ratio()
+        return _similarity(str1.lower(), str2.lower())
     
-    def _validate_age(self, dob: str) -> Dict:
+    def _validate_age(self, dob: Union[str, date, datetime]) -> Dict:
         """Validate age from date of birth"""
         try:
             if isinstance(dob, str):
-                dob_date = datetime.strptime(dob, '%Y-%m-%d')
+                dob_date = _parse_dob(dob)
+            elif isinstance(dob, datetime):
+                dob_date = dob.date()
             else:
                 dob_date = dob
             
-            age = (datetime.now() - dob_date).days // 365
+            today = self._today
+            age = today.year - dob_date.year - ((today.month, today.day) < (dob_date.month, dob_date.day))
             
-            if age < self.thresholds['min_age']:
+            if dob_date > self._max_dob:
                 return {
                     'valid': False,
                     'age': age,
                     'reason': f'Age {age} is below minimum {self.thresholds["min_age"]}'
                 }
-            elif age > self.thresholds['max_age']:
+            elif dob_date < self._min_dob:
                 return {
                     'valid': False,
                     'age': age,
@@ -662,35 +860,34 @@ class ValidationRiskScorer:
                 }
             
             return {'valid': True, 'age': age}
-        except:
+        except (ValueError, TypeError, AttributeError):
+            # Unparseable string, or a value that is not a date at all
             return {'valid': False, 'reason': 'Invalid date format'}
     
     def _is_valid_email(self, email: str) -> bool:
         """Validate email format"""
-        pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-        return bool(re.match(pattern, email))
+        return bool(_EMAIL_RE.match(email))
     
     def _is_valid_phone(self, phone: str) -> bool:
         """Validate phone format"""
         # Remove all non-digit characters
-        digits = re.sub(r'\D', '', phone)
+        digits = _digits_only(phone)
         # Should be 10 digits (Indian) or 12 with country code
         return len(digits) in [10, 12]
     
     def _is_valid_pan(self, pan: str) -> bool:
         """Validate PAN format"""
-        pattern = r'^[A-Z]{5}[0-9]{4}[A-Z]{1}$'
-        return bool(re.match(pattern, pan))
+        return bool(_PAN_RE.match(pan))
     
     def _is_valid_aadhaar(self, aadhaar: str) -> bool:
         """Validate Aadhaar format"""
-        digits = re.sub(r'\D', '', aadhaar)
+        digits = _digits_only(aadhaar)
         return len(digits) == 12 and not digits.startswith(('0', '1'))
     
     def _has_repeated_pattern(self, text: str) -> bool:
         """Check for suspicious repeated patterns"""
         # Check for 3+ repeated characters
-        if re.search(r'(.)\1{2,}', text):
+        if _REPEAT_RE.search(text):
             return True
         # Check for repeated words
         words = text.lower().split()
@@ -703,49 +900,42 @@ def format_validation_report(validation_result: Dict) -> str:
     """
     Format validation result as readable report
     """
-    report = []
-    report.append("=" * 60)
-    report.append("KYC VALIDATION & RISK ASSESSMENT REPORT")
-    report.append("=" * 60)
-    report.append("")
+    report = io.StringIO()
+    write = report.write
+    write(f"{_HEAVY_RULE}\nKYC VALIDATION & RISK ASSESSMENT REPORT\n{_HEAVY_RULE}\n\n")
     
     # Overall result
     status = "✓ PASSED" if validation_result['is_valid'] else "✗ FAILED"
-    report.append(f"Overall Status: {status}")
-    report.append(f"Risk Score: {validation_result['risk_score']}/100")
-    report.append(f"Risk Level: {validation_result['risk_level']}")
-    report.append("")
+    write(f"Overall Status: {status}\n")
+    write(f"Risk Score: {validation_result['risk_score']}/100\n")
+    write(f"Risk Level: {validation_result['risk_level']}\n\n")
     
     # Scores breakdown
-    report.append("Scores Breakdown:")
-    report.append("-" * 60)
+    write(f"Scores Breakdown:\n{_RULE}\n")
     for category, score in validation_result['scores_breakdown'].items():
-        report.append(f"  {category.replace('_', ' ').title()}: {score}/100")
-    report.append("")
+        label = _CATEGORY_LABELS.get(category) or category.replace('_', ' ').title()
+        write(f"  {label}: {score}/100\n")
+    write("\n")
     
     # Anomalies
     anomalies = validation_result['anomalies']
-    report.append(f"Anomalies Detected: {len(anomalies)}")
-    report.append("-" * 60)
+    write(f"Anomalies Detected: {len(anomalies)}\n{_RULE}\n")
     if anomalies:
         for i, anomaly in enumerate(anomalies, 1):
-            report.append(f"{i}. [{anomaly['severity'].upper()}] {anomaly['type']}")
-            report.append(f"   Field: {anomaly['field']}")
-            report.append(f"   {anomaly['description']}")
-            report.append("")
+            write(f"{i}. [{anomaly['severity'].upper()}] {anomaly['type']}\n")
+            write(f"   Field: {anomaly['field']}\n")
+            write(f"   {anomaly['description']}\n\n")
     else:
-        report.append("  No anomalies detected")
-        report.append("")
+        write("  No anomalies detected\n\n")
     
     # Recommendations
-    report.append("Recommendations:")
-    report.append("-" * 60)
+    write(f"Recommendations:\n{_RULE}\n")
     for i, rec in enumerate(validation_result['recommendations'], 1):
-        report.append(f"{i}. {rec}")
+        write(f"{i}. {rec}\n")
     
-    report.append("=" * 60)
+    write(_HEAVY_RULE)
     
-    return "\n".join(report)
+    return report.getvalue()
 
 
 if __name__ == "__main__":